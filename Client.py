@@ -1,5 +1,11 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import select
 import socket
 import struct
+import sys
 import threading
 import time
 from termcolor import colored  # Import termcolor for colored output
@@ -11,6 +17,52 @@ PAYLOAD_MESSAGE_TYPE = 0x4  # Indicates a data payload message
 UDP_PORT = 14117  # Default UDP port for communication
 TCP_PORT = 65432  # Default TCP port for communication
 BUFFER_SIZE = 1024  # Size of data chunks for sending/receiving
+CLOCK_CHECK_INTERVAL = 64  # Datagrams drained between deadline checks in udp_transfer
+OFFER_HEADER = struct.Struct('!IBHH')  # Layout of server offer messages
+REQUEST_HEADER = struct.Struct('!IBQ')  # Layout of request messages sent to the server
+# Kernel receive buffer size requested for UDP transfers, best effort: Linux caps it at net.core.rmem_max
+# (raise it, e.g. sysctl -w net.core.rmem_max=16777216, for full effect) and BSD/macOS get a smaller size
+UDP_SOCKET_BUFFER_SIZE = 16 * 1024 * 1024
+
+class ColoredFormatter(logging.Formatter):
+    """Format log records as colored console lines: errors in red, everything else in green."""
+
+    def format(self, record):
+        return colored(super().format(record), "red" if record.levelno >= logging.ERROR else "green")
+
+# Handlers only enqueue log records; a single listener thread formats them and writes to stdout,
+# so worker threads never contend for the stdout lock
+log_queue = queue.Queue()
+console_handler = logging.StreamHandler(sys.stdout)
+console_handler.setFormatter(ColoredFormatter())
+log_listener = logging.handlers.QueueListener(log_queue, console_handler)
+log_listener.start()
+atexit.register(log_listener.stop)  # Flush queued messages before the interpreter exits
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+def grow_socket_buffer(sock, option, size):
+    """
+    Enlarge a socket's kernel buffer as far as the platform allows.
+
+    Linux silently caps the request, but BSD and macOS reject sizes above
+    kern.ipc.maxsockbuf with ENOBUFS, so the size is halved until it is
+    accepted. If even 64 KiB is refused, the default buffer is kept.
+
+    Args:
+        sock (socket): The socket to configure.
+        option (int): socket.SO_RCVBUF or socket.SO_SNDBUF.
+        size (int): The preferred buffer size in bytes.
+    """
+    while size >= 64 * 1024:
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, option, size)
+            return
+        except OSError:
+            size //= 2
 
 def listen_for_offers():
     """
@@ -23,22 +75,23 @@ def listen_for_offers():
     Returns:
         tuple: A tuple containing the server's IP address (str), TCP port (int), and UDP port (int).
     """
-    print(colored("Client started, listening for offer requests...", "green"))
+    logger.info("Client started, listening for offer requests...")
     with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as udp_socket:
         udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)  # Allow multiple binds to the same port
         udp_socket.bind(('', UDP_PORT))  # Bind to the specified UDP port for listening
+        message = bytearray(BUFFER_SIZE)  # Reused for every datagram so non-offers cost no allocation
         while True:
             try:
                 # Receive data from the server
-                message, address = udp_socket.recvfrom(BUFFER_SIZE)
-                if len(message) >= 9:
+                length, address = udp_socket.recvfrom_into(message)
+                if length >= OFFER_HEADER.size:
                     # Unpack the message and validate its contents
-                    cookie, message_type, udp_port, tcp_port = struct.unpack('!IBHH', message[:9])
+                    cookie, message_type, udp_port, tcp_port = OFFER_HEADER.unpack_from(message)
                     if cookie == MAGIC_COOKIE and message_type == OFFER_MESSAGE_TYPE:
-                        print(colored(f"Received offer from {address[0]} on TCP port {tcp_port}, UDP port {udp_port}", "green"))
+                        logger.info("Received offer from %s on TCP port %d, UDP port %d", address[0], tcp_port, udp_port)
                         return address[0], tcp_port, udp_port
             except Exception as e:
-                print(colored(f"Error receiving offer: {e}", "red"))
+                logger.error("Error receiving offer: %s", e)
 
 def tcp_transfer(server_ip, tcp_port, file_size):
     """
@@ -52,21 +105,24 @@ def tcp_transfer(server_ip, tcp_port, file_size):
         tcp_port (int): The TCP port to connect to on the server.
         file_size (int): The size of the file to request (in bytes).
     """
-    start_time = time.time()  # Record the start time of the transfer
+    start_time = time.monotonic_ns()  # Record the start time of the transfer
     try:
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as tcp_socket:
             tcp_socket.connect((server_ip, tcp_port))  # Connect to the server
+            tcp_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # Disable Nagle so the request goes out immediately
+            if hasattr(socket, 'TCP_QUICKACK'):
+                tcp_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)  # Don't delay ACKs for the first data
             tcp_socket.sendall(f"{file_size}\n".encode())  # Send the file size request
             received = 0
             while received < file_size:
                 # Receive data in chunks until the requested file size is reached
                 data = tcp_socket.recv(BUFFER_SIZE)
                 received += len(data)
-        end_time = time.time()  # Record the end time of the transfer
-        speed = (received / (end_time - start_time)) * 8  # Calculate speed in bits/second
-        print(colored(f"TCP transfer finished, total time: {end_time - start_time:.2f} seconds, speed: {speed:.2f} bits/second", "green"))
+        elapsed = (time.monotonic_ns() - start_time) / 1e9  # Transfer duration in seconds
+        speed = (received / elapsed) * 8  # Calculate speed in bits/second
+        logger.info("TCP transfer finished, total time: %.2f seconds, speed: %.2f bits/second", elapsed, speed)
     except Exception as e:
-        print(colored(f"Error during TCP transfer: {e}", "red"))
+        logger.error("Error during TCP transfer: %s", e)
 
 def udp_transfer(server_ip, udp_port, file_size):
     """
@@ -83,29 +139,40 @@ def udp_transfer(server_ip, udp_port, file_size):
     total_received = 0  # Total bytes received from the server
     total_segments = file_size // BUFFER_SIZE  # Total expected segments
     received_segments = 0  # Count of successfully received segments
+    buffer = memoryview(bytearray(BUFFER_SIZE))  # Reused for every datagram instead of allocating new bytes
 
     try:
         with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as udp_socket:
+            grow_socket_buffer(udp_socket, socket.SO_RCVBUF, UDP_SOCKET_BUFFER_SIZE)  # Room for bursts of segments
             # Send a request to the server for the specified file size
-            udp_socket.sendto(struct.pack('!IBQ', MAGIC_COOKIE, REQUEST_MESSAGE_TYPE, file_size), (server_ip, udp_port))
-            print(colored(f"UDP request sent to {server_ip}:{udp_port} for file size {file_size} bytes.", "green"))
-            start_time = time.time()  # Record the start time of the transfer
-            while time.time() - start_time < 1:  # Continue receiving until timeout
-                try:
-                    udp_socket.settimeout(1)  # Set timeout for receiving packets
-                    data, _ = udp_socket.recvfrom(BUFFER_SIZE)
-                    if len(data) >= 20:  # Ensure the data contains the payload structure
-                        received_segments += 1
-                        total_received += len(data) - 20  # Exclude header size from payload
-                except socket.timeout:
+            udp_socket.sendto(REQUEST_HEADER.pack(MAGIC_COOKIE, REQUEST_MESSAGE_TYPE, file_size), (server_ip, udp_port))
+            logger.info("UDP request sent to %s:%d for file size %d bytes.", server_ip, udp_port, file_size)
+            start_time = time.monotonic_ns()  # Record the start time of the transfer
+            deadline = start_time + 10 ** 9  # Continue receiving for one second
+            udp_socket.setblocking(False)  # Wait with select() once, then drain without per-packet timeouts
+            while True:
+                remaining = (deadline - time.monotonic_ns()) / 1e9  # Seconds left, sampled once per wake-up
+                if remaining <= 0 or not select.select([udp_socket], [], [], remaining)[0]:
                     break
-
-        end_time = time.time()  # Record the end time of the transfer
+                try:
+                    drained = 0
+                    while True:  # Drain every datagram already queued by the kernel
+                        length = udp_socket.recv_into(buffer)
+                        if length >= 20:  # Ensure the data contains the payload structure
+                            received_segments += 1
+                            total_received += length - 20  # Exclude header size from payload
+                        drained += 1
+                        if drained % CLOCK_CHECK_INTERVAL == 0 and time.monotonic_ns() >= deadline:
+                            break  # A sender that keeps the queue full must not stretch the window
+                except BlockingIOError:
+                    pass
+
+        elapsed = (time.monotonic_ns() - start_time) / 1e9  # Transfer duration in seconds
         success_rate = (received_segments / total_segments) * 100 if total_segments > 0 else 0  # Calculate success rate
-        speed = (total_received / (end_time - start_time)) * 8 if end_time > start_time else 0  # Speed in bits/second
-        print(colored(f"UDP transfer finished, total time: {end_time - start_time:.2f} seconds, speed: {speed:.2f} bits/second, percentage of packets received successfully: {success_rate:.2f}%", "green"))
+        speed = (total_received / elapsed) * 8 if elapsed > 0 else 0  # Speed in bits/second
+        logger.info("UDP transfer finished, total time: %.2f seconds, speed: %.2f bits/second, percentage of packets received successfully: %.2f%%", elapsed, speed, success_rate)
     except Exception as e:
-        print(colored(f"Error during UDP transfer: {e}", "red"))
+        logger.error("Error during UDP transfer: %s", e)
 
 def start_client():
     """
@@ -127,18 +194,18 @@ def start_client():
         t = threading.Thread(target=tcp_transfer, args=(server_ip, tcp_port, file_size))
         t.start()
         threads.append(t)
-        print(colored(f"TCP transfer #{i} started", "green"))
+        logger.info("TCP transfer #%d started", i)
 
     for i in range(1, udp_connections + 1):
         t = threading.Thread(target=udp_transfer, args=(server_ip, udp_port, file_size))
         t.start()
         threads.append(t)
-        print(colored(f"UDP transfer #{i} started", "green"))
+        logger.info("UDP transfer #%d started", i)
 
     # Wait for all threads to complete
     for t in threads:
         t.join()
-    print(colored("All transfers complete, listening to offer requests...", "green"))
+    logger.info("All transfers complete, listening to offer requests...")
 
 if __name__ == '__main__':
     start_client()
\ No newline at end of file
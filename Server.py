@@ -1,7 +1,17 @@
+import atexit
+import ctypes
+import errno
+import itertools
+import logging
+import logging.handlers
+import os
+import queue
 import socket
 import struct
+import sys
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from termcolor import colored  # Import termcolor for colored output
 
 # Constants for message protocol and communication
@@ -12,6 +22,98 @@ PAYLOAD_MESSAGE_TYPE = 0x4  # Indicates a data payload message
 UDP_PORT = 14117  # Port for broadcasting offer messages
 TCP_PORT = 65432  # Port for TCP connections
 BUFFER_SIZE = 1024  # Size of data chunks
+BIG_CHUNK = b'X' * (256 * 1024)  # Preallocated TCP payload, sent in large writes to cut syscalls
+ZEROCOPY_THRESHOLD = 10 * 1024  # TCP transfers up to this size are cheaper to copy than to send zero-copy
+OFFER_HEADER = struct.Struct('!IBHH')  # Layout of offer messages
+REQUEST_HEADER = struct.Struct('!IBQ')  # Layout of client request messages
+REQUEST_PREFIX = struct.pack('!IB', MAGIC_COOKIE, REQUEST_MESSAGE_TYPE)  # Leading bytes of every valid request
+PAYLOAD_HEADER = struct.Struct('!IBQQ')  # Header of each UDP payload segment
+PAYLOAD_PADDING = b'X' * (BUFFER_SIZE - PAYLOAD_HEADER.size)  # Filler after the header of each UDP segment
+# Kernel buffer size requested for UDP sockets, best effort: Linux caps it at net.core.rmem_max / wmem_max
+# (raise those sysctls, e.g. to 16777216, for it to take full effect) and BSD/macOS get a smaller size
+UDP_SOCKET_BUFFER_SIZE = 16 * 1024 * 1024
+
+# Source of zero bytes for sendfile(), opened once at startup. Only Linux accepts a non-regular source
+# file and a None offset, so every other platform gets None and keeps the plain send loop
+try:
+    ZERO_FD = os.open('/dev/zero', os.O_RDONLY) if sys.platform.startswith('linux') else None
+except OSError:
+    ZERO_FD = None
+
+SENDMMSG_BATCH = 64  # Number of UDP segments submitted per sendmmsg() call
+
+class _IOVec(ctypes.Structure):
+    """ctypes mirror of struct iovec."""
+    _fields_ = [('iov_base', ctypes.c_void_p), ('iov_len', ctypes.c_size_t)]
+
+class _MsgHdr(ctypes.Structure):
+    """ctypes mirror of the Linux struct msghdr."""
+    _fields_ = [('msg_name', ctypes.c_void_p), ('msg_namelen', ctypes.c_uint32),
+                ('msg_iov', ctypes.POINTER(_IOVec)), ('msg_iovlen', ctypes.c_size_t),
+                ('msg_control', ctypes.c_void_p), ('msg_controllen', ctypes.c_size_t),
+                ('msg_flags', ctypes.c_int)]
+
+class _MMsgHdr(ctypes.Structure):
+    """ctypes mirror of struct mmsghdr, one entry of a sendmmsg() batch."""
+    _fields_ = [('msg_hdr', _MsgHdr), ('msg_len', ctypes.c_uint)]
+
+def _load_sendmmsg():
+    """
+    Bind libc's sendmmsg() through ctypes.
+
+    Returns:
+        function: The sendmmsg() foreign function, or None if the platform does not provide it.
+    """
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        sendmmsg = ctypes.CDLL(None, use_errno=True).sendmmsg
+    except (OSError, AttributeError):
+        return None
+    sendmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int]
+    sendmmsg.restype = ctypes.c_int
+    return sendmmsg
+
+SENDMMSG = _load_sendmmsg()  # None where sendmmsg() is unavailable, e.g. Windows
+
+UDP_SOCKET_POOL_SIZE = (os.cpu_count() or 1) * 2  # Maximum number of idle UDP sockets kept for reuse
+udp_socket_pool = queue.SimpleQueue()  # Idle UDP sockets shared by the UDP client handlers
+
+# One listener per CPU sharing each port through SO_REUSEPORT on Linux, which balances load across them.
+# macOS and BSD accept SO_REUSEPORT but deliver to a single socket, so they keep one listener
+LISTENER_COUNT = (os.cpu_count() or 1) if sys.platform.startswith('linux') else 1
+
+# Bounded worker pools that reuse handler threads instead of starting one thread per client
+HANDLER_POOL_SIZE = max(32, (os.cpu_count() or 1) * 4)
+REQUEST_TIMEOUT = 5  # Seconds a TCP client may take to send its request before its worker is released
+UDP_REQUEST_MAX_WAIT = 1  # Seconds a queued UDP request stays useful; the client only listens for one second
+tcp_executor = ThreadPoolExecutor(max_workers=HANDLER_POOL_SIZE, thread_name_prefix='tcp-handler')
+udp_executor = ThreadPoolExecutor(max_workers=HANDLER_POOL_SIZE, thread_name_prefix='udp-handler')
+
+# CPUs the handler threads get pinned to, or None where thread affinity is unsupported (e.g. Windows).
+# Pair this with NIC interrupt pinning (e.g. set_irq_affinity.sh) so RX queue i is served by CPU i.
+HANDLER_CPUS = sorted(os.sched_getaffinity(0)) if hasattr(os, 'sched_setaffinity') else None
+handler_cpu_cycle = itertools.cycle(HANDLER_CPUS) if HANDLER_CPUS else None  # Round-robin fallback
+
+class ColoredFormatter(logging.Formatter):
+    """Format log records as colored console lines: errors in red, everything else in green."""
+
+    def format(self, record):
+        return colored(super().format(record), "red" if record.levelno >= logging.ERROR else "green")
+
+# Handlers only enqueue log records; a single listener thread formats them and writes to stdout,
+# so worker threads never contend for the stdout lock
+log_queue = queue.Queue()
+console_handler = logging.StreamHandler(sys.stdout)
+console_handler.setFormatter(ColoredFormatter())
+log_listener = logging.handlers.QueueListener(log_queue, console_handler)
+log_listener.start()
+atexit.register(log_listener.stop)  # Flush queued messages before the interpreter exits
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
+logger.setLevel(logging.INFO)  # Debug messages (e.g. every offer broadcast) stay off by default
+logger.propagate = False
 
 def send_offers():
     """
@@ -23,12 +125,33 @@ def send_offers():
     with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as udp_socket:
         udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
         udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        offer_message = struct.pack('!IBHH', MAGIC_COOKIE, OFFER_MESSAGE_TYPE, UDP_PORT, TCP_PORT)
+        offer_message = OFFER_HEADER.pack(MAGIC_COOKIE, OFFER_MESSAGE_TYPE, UDP_PORT, TCP_PORT)
+        logger.info("Broadcasting offer messages every second")
         while True:
             udp_socket.sendto(offer_message, ('<broadcast>', UDP_PORT))
-            print(colored("Offer message sent via broadcast", "green"))
+            logger.debug("Offer message sent via broadcast")
             time.sleep(1)
 
+def send_zeros(sock_fd, zero_fd, count):
+    """
+    Send zero bytes to a socket with sendfile(), entirely inside the kernel.
+
+    os.sendfile() is a direct binding of sendfile(2) that releases the GIL,
+    so each call moves up to 1 GiB without any Python code running per chunk.
+
+    Args:
+        sock_fd (int): File descriptor of the connected TCP socket.
+        zero_fd (int): File descriptor of /dev/zero.
+        count (int): The number of bytes to send.
+
+    Returns:
+        int: The number of bytes sent.
+    """
+    sent = 0
+    while sent < count:
+        sent += os.sendfile(sock_fd, zero_fd, None, min(count - sent, 2 ** 30))
+    return sent
+
 def handle_tcp_client(connection, client_address):
     """
     Handle a TCP client request.
@@ -41,96 +164,319 @@ def handle_tcp_client(connection, client_address):
         client_address (tuple): The client's address (IP, port).
     """
     try:
-        print(colored(f"Handling TCP connection from {client_address}", "green"))
+        logger.info("Handling TCP connection from %s", client_address)
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # Disable Nagle to avoid batching delays
+        connection.settimeout(REQUEST_TIMEOUT)  # A client that never sends its request must not hold a pooled worker
         file_size = int(connection.recv(BUFFER_SIZE).decode().strip())
-        print(colored(f"TCP client requested file of size: {file_size} bytes", "green"))
-        data = b'X' * BUFFER_SIZE
+        connection.settimeout(None)  # Back to blocking mode for the bulk send
+        if file_size < 0:
+            raise ValueError(f"invalid file size {file_size}")
+        if hasattr(socket, 'TCP_QUICKACK'):
+            # ACK the request right away; the kernel clears this flag again after each ACK
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+        logger.info("TCP client requested file of size: %d bytes", file_size)
         bytes_sent = 0
-        start_time = time.time()
-        while bytes_sent < file_size:
-            connection.send(data)
-            bytes_sent += len(data)
-        end_time = time.time()
-        speed = (bytes_sent / (end_time - start_time)) * 8  # Convert to bits/second
-        print(colored(f"Sent {bytes_sent} bytes over TCP to {client_address} at {speed:.2f} bits/second", "green"))
+        start_time = time.monotonic_ns()
+        if ZERO_FD is not None and file_size > ZEROCOPY_THRESHOLD:
+            # Let the kernel move the data straight into the socket without copying through userspace
+            bytes_sent = send_zeros(connection.fileno(), ZERO_FD, file_size)
+        else:
+            while bytes_sent + len(BIG_CHUNK) <= file_size:
+                connection.sendall(BIG_CHUNK)
+                bytes_sent += len(BIG_CHUNK)
+            if bytes_sent < file_size:
+                connection.sendall(memoryview(BIG_CHUNK)[:file_size - bytes_sent])  # Send the remaining tail
+                bytes_sent = file_size
+        elapsed = (time.monotonic_ns() - start_time) / 1e9  # Transfer duration in seconds
+        speed = (bytes_sent / elapsed) * 8  # Convert to bits/second
+        logger.info("Sent %d bytes over TCP to %s at %.2f bits/second", bytes_sent, client_address, speed)
     except Exception as e:
-        print(colored(f"Error handling TCP client {client_address}: {e}", "red"))
+        logger.error("Error handling TCP client %s: %s", client_address, e)
     finally:
         try:
             connection.shutdown(socket.SHUT_RDWR)
         except Exception:
             pass
         connection.close()
-        print(colored(f"Connection with {client_address} closed", "green"))
+        logger.info("Connection with %s closed", client_address)
 
-def handle_udp_client(client_address, file_size):
+def send_udp_segments_batched(udp_socket, client_address, total_segments):
+    """
+    Send UDP payload segments with one sendmmsg() system call per batch.
+
+    Each segment is sent as two iovecs: its own header slot in a small shared
+    header buffer and the common padding, so only the headers are rewritten
+    per batch and no full-size segment is ever assembled in userspace. Up to
+    SENDMMSG_BATCH segments are handed to the kernel at once instead of
+    calling sendto() for every segment.
+
+    Args:
+        udp_socket (socket): The UDP socket to send from.
+        client_address (tuple): The client's address (IP, port).
+        total_segments (int): The number of segments to send.
+
+    Returns:
+        int: The number of bytes sent.
+    """
+    headers = bytearray(SENDMMSG_BATCH * PAYLOAD_HEADER.size)
+    headers_address = ctypes.addressof((ctypes.c_char * len(headers)).from_buffer(headers))
+    padding = ctypes.create_string_buffer(PAYLOAD_PADDING, len(PAYLOAD_PADDING))
+    # struct sockaddr_in: family in host byte order, port and address in network byte order
+    address = ctypes.create_string_buffer(struct.pack('=H', socket.AF_INET) + struct.pack('!H4s8x', client_address[1], socket.inet_aton(client_address[0])), 16)
+    iovecs = (_IOVec * (2 * SENDMMSG_BATCH))()
+    messages = (_MMsgHdr * SENDMMSG_BATCH)()
+    for i in range(SENDMMSG_BATCH):
+        iovecs[2 * i].iov_base = headers_address + i * PAYLOAD_HEADER.size
+        iovecs[2 * i].iov_len = PAYLOAD_HEADER.size
+        iovecs[2 * i + 1].iov_base = ctypes.addressof(padding)
+        iovecs[2 * i + 1].iov_len = len(padding)
+        messages[i].msg_hdr.msg_name = ctypes.addressof(address)
+        messages[i].msg_hdr.msg_namelen = len(address)
+        messages[i].msg_hdr.msg_iov = ctypes.pointer(iovecs[2 * i])
+        messages[i].msg_hdr.msg_iovlen = 2
+
+    fd = udp_socket.fileno()
+    segment_num = 0
+    while segment_num < total_segments:
+        count = min(SENDMMSG_BATCH, total_segments - segment_num)
+        for i in range(count):
+            PAYLOAD_HEADER.pack_into(headers, i * PAYLOAD_HEADER.size, MAGIC_COOKIE, PAYLOAD_MESSAGE_TYPE, total_segments, segment_num + i)
+        sent = SENDMMSG(fd, messages, count, 0)
+        if sent < 0:
+            err = ctypes.get_errno()
+            if err == errno.EINTR:
+                continue  # Interrupted before anything was sent, retry the same batch
+            raise OSError(err, os.strerror(err))
+        segment_num += sent  # A short submit resumes from the first unsent segment
+    return total_segments * BUFFER_SIZE
+
+def grow_socket_buffer(sock, option, size):
+    """
+    Enlarge a socket's kernel buffer as far as the platform allows.
+
+    Linux silently caps the request, but BSD and macOS reject sizes above
+    kern.ipc.maxsockbuf with ENOBUFS, so the size is halved until it is
+    accepted. If even 64 KiB is refused, the default buffer is kept.
+
+    Args:
+        sock (socket): The socket to configure.
+        option (int): socket.SO_RCVBUF or socket.SO_SNDBUF.
+        size (int): The preferred buffer size in bytes.
+    """
+    while size >= 64 * 1024:
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, option, size)
+            return
+        except OSError:
+            size //= 2
+
+def _get_udp_socket():
+    """
+    Take a UDP socket from the pool, creating a new one if the pool is empty.
+
+    Returns:
+        socket: A UDP socket to send payload segments from.
+    """
+    try:
+        return udp_socket_pool.get_nowait()
+    except queue.Empty:
+        udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        grow_socket_buffer(udp_socket, socket.SO_SNDBUF, UDP_SOCKET_BUFFER_SIZE)  # Absorb bursts of segments
+        return udp_socket
+
+def _return_udp_socket(udp_socket):
+    """
+    Give a UDP socket back to the pool, closing it if the pool is already full.
+
+    Args:
+        udp_socket (socket): The UDP socket to release.
+    """
+    if udp_socket_pool.qsize() < UDP_SOCKET_POOL_SIZE:
+        udp_socket_pool.put(udp_socket)
+    else:
+        udp_socket.close()
+
+def handle_udp_client(client_address, file_size, received_at=None):
     """
     Handle a UDP client request.
 
     This function sends the requested file data in chunks over UDP
-    and calculates the transfer speed.
+    and calculates the transfer speed. Requests that waited in the worker
+    pool longer than UDP_REQUEST_MAX_WAIT are dropped, since the client has
+    stopped listening by then.
 
     Args:
         client_address (tuple): The client's address (IP, port).
         file_size (int): The size of the file to send in bytes.
+        received_at (int): time.monotonic_ns() when the request arrived, if known.
     """
+    if received_at is not None and time.monotonic_ns() - received_at > UDP_REQUEST_MAX_WAIT * 10 ** 9:
+        logger.error("Dropping UDP request from %s that waited too long for a worker", client_address)
+        return
     try:
-        print(colored(f"Handling UDP client from {client_address} requesting file of size: {file_size}", "green"))
+        logger.info("Handling UDP client from %s requesting file of size: %d", client_address, file_size)
         total_segments = file_size // BUFFER_SIZE
         bytes_sent = 0
-        start_time = time.time()
-        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as udp_socket:
-            for segment_num in range(total_segments):
-                payload = struct.pack('!IBQQ', MAGIC_COOKIE, PAYLOAD_MESSAGE_TYPE, total_segments, segment_num)
-                payload += b'X' * (BUFFER_SIZE - len(payload))
-                udp_socket.sendto(payload, client_address)
-                bytes_sent += len(payload)
-                print(colored(f"Sent segment {segment_num + 1}/{total_segments} to {client_address}", "green"))
-        end_time = time.time()
-        speed = (bytes_sent / (end_time - start_time)) * 8  # Convert to bits/second
-        print(colored(f"Sent {bytes_sent} bytes over UDP to {client_address} at {speed:.2f} bits/second", "green"))
+        start_time = time.monotonic_ns()
+        udp_socket = _get_udp_socket()
+        try:
+            if SENDMMSG is not None:
+                bytes_sent = send_udp_segments_batched(udp_socket, client_address, total_segments)
+            else:
+                # Build the segment once and only rewrite the header for each packet
+                payload = bytearray(BUFFER_SIZE)
+                payload[PAYLOAD_HEADER.size:] = PAYLOAD_PADDING
+                for segment_num in range(total_segments):
+                    PAYLOAD_HEADER.pack_into(payload, 0, MAGIC_COOKIE, PAYLOAD_MESSAGE_TYPE, total_segments, segment_num)
+                    udp_socket.sendto(payload, client_address)
+                    bytes_sent += len(payload)
+        finally:
+            _return_udp_socket(udp_socket)
+        elapsed = (time.monotonic_ns() - start_time) / 1e9  # Transfer duration in seconds
+        speed = (bytes_sent / elapsed) * 8  # Convert to bits/second
+        logger.info("Sent %d bytes over UDP to %s at %.2f bits/second", bytes_sent, client_address, speed)
     except Exception as e:
-        print(colored(f"Error handling UDP client {client_address}: {e}", "red"))
+        logger.error("Error handling UDP client %s: %s", client_address, e)
 
-def start_tcp_server():
+def open_listener(socket_type, port):
     """
-    Start the TCP server to handle client connections.
+    Create a socket bound to the given port on all interfaces.
+
+    When several listeners are used, SO_REUSEPORT lets them share the port
+    so the kernel spreads incoming connections and datagrams across them.
+
+    Args:
+        socket_type (int): socket.SOCK_STREAM or socket.SOCK_DGRAM.
+        port (int): The port to bind to.
 
-    The server listens for incoming TCP connections and starts a new thread
-    to handle each client.
+    Returns:
+        socket: The bound socket.
     """
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as tcp_socket:
-        tcp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        tcp_socket.bind(('172.20.10.3', TCP_PORT))  # Listen on all interfaces
-        tcp_socket.listen()
-        print(colored(f"TCP server listening on port {TCP_PORT}", "green"))
+    listener = socket.socket(socket.AF_INET, socket_type)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if LISTENER_COUNT > 1:
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    listener.bind(('0.0.0.0', port))  # Listen on all interfaces
+    return listener
+
+def _pick_handler_cpu(sock):
+    """
+    Choose the CPU a client handler should run on.
+
+    Prefers the CPU that processed the socket's incoming packets (SO_INCOMING_CPU)
+    so the handler shares its caches with the kernel's receive path, and falls
+    back to round-robin over HANDLER_CPUS.
+
+    Args:
+        sock (socket): The socket the client's data arrived on.
+
+    Returns:
+        int: The CPU number.
+    """
+    if hasattr(socket, 'SO_INCOMING_CPU'):
+        try:
+            cpu = sock.getsockopt(socket.SOL_SOCKET, socket.SO_INCOMING_CPU)
+            if cpu in HANDLER_CPUS:
+                return cpu
+        except OSError:
+            pass
+    return next(handler_cpu_cycle)
+
+def submit_pinned(executor, sock, handler, *args):
+    """
+    Submit a client handler to a worker pool, pinning the worker thread to a CPU first.
+
+    Args:
+        executor (ThreadPoolExecutor): The worker pool to run the handler on.
+        sock (socket): The socket the client's data arrived on, used to pick the CPU.
+        handler (callable): The client handler.
+        *args: Arguments passed to the handler.
+
+    Returns:
+        Future: The submitted task.
+    """
+    if handler_cpu_cycle is None:
+        return executor.submit(handler, *args)
+    cpu = _pick_handler_cpu(sock)
+
+    def run_pinned():
+        try:
+            os.sched_setaffinity(0, {cpu})  # Pins only the calling worker thread
+        except OSError as e:
+            # e.g. the cpuset shrank after startup. Reused pool threads keep the previous task's pin,
+            # so widen the mask back to the process's CPUs before running the handler anyway
+            logger.debug("Could not pin handler thread to CPU %d: %s", cpu, e)
+            try:
+                os.sched_setaffinity(0, os.sched_getaffinity(os.getpid()))
+            except OSError:
+                pass
+        return handler(*args)
+
+    return executor.submit(run_pinned)
+
+def accept_tcp_clients(tcp_socket):
+    """
+    Accept TCP connections on a listener and hand each client to the TCP worker pool.
+
+    Args:
+        tcp_socket (socket): The listening TCP socket.
+    """
+    with tcp_socket:
         while True:
             try:
                 connection, client_address = tcp_socket.accept()
-                threading.Thread(target=handle_tcp_client, args=(connection, client_address)).start()
+                submit_pinned(tcp_executor, connection, handle_tcp_client, connection, client_address)
             except Exception as e:
-                print(colored(f"Error accepting TCP connection: {e}", "red"))
+                logger.error("Error accepting TCP connection: %s", e)
 
-def start_udp_server():
+def receive_udp_requests(udp_socket):
     """
-    Start the UDP server to handle client requests.
+    Receive UDP requests on a listener and hand each client to the UDP worker pool.
 
-    The server listens for incoming UDP requests and starts a new thread
-    to handle each client.
+    Args:
+        udp_socket (socket): The bound UDP socket.
     """
-    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as udp_socket:
-        udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        udp_socket.bind(('172.20.10.3', UDP_PORT))  # Listen on all interfaces
-        print(colored(f"UDP server listening on port {UDP_PORT}", "green"))
+    data = bytearray(BUFFER_SIZE)  # Reused for every datagram so foreign traffic costs no allocation
+    with udp_socket:
         while True:
             try:
-                data, client_address = udp_socket.recvfrom(BUFFER_SIZE)
-                if len(data) >= 13:
-                    cookie, message_type, file_size = struct.unpack('!IBQ', data[:13])
-                    if cookie == MAGIC_COOKIE and message_type == REQUEST_MESSAGE_TYPE:
-                        threading.Thread(target=handle_udp_client, args=(client_address, file_size)).start()
+                length, client_address = udp_socket.recvfrom_into(data)
+                # Compare the cookie and message type as raw bytes before parsing anything
+                if length >= REQUEST_HEADER.size and data.startswith(REQUEST_PREFIX):
+                    _, _, file_size = REQUEST_HEADER.unpack_from(data)
+                    submit_pinned(udp_executor, udp_socket, handle_udp_client, client_address, file_size, time.monotonic_ns())
             except Exception as e:
-                print(colored(f"Error in UDP server: {e}", "red"))
+                logger.error("Error in UDP server: %s", e)
+
+def start_tcp_server():
+    """
+    Start the TCP server to handle client connections.
+
+    The server opens LISTENER_COUNT listeners on the TCP port and runs an
+    accept loop for each one, handing each client to a pooled worker thread.
+    """
+    listeners = [open_listener(socket.SOCK_STREAM, TCP_PORT) for _ in range(LISTENER_COUNT)]
+    for tcp_socket in listeners:
+        tcp_socket.listen()
+    logger.info("TCP server listening on port %d with %d listener(s)", TCP_PORT, LISTENER_COUNT)
+    for tcp_socket in listeners[1:]:
+        threading.Thread(target=accept_tcp_clients, args=(tcp_socket,), daemon=True).start()
+    accept_tcp_clients(listeners[0])
+
+def start_udp_server():
+    """
+    Start the UDP server to handle client requests.
+
+    The server opens LISTENER_COUNT listeners on the UDP port and runs a
+    receive loop for each one, handing each client to a pooled worker thread.
+    """
+    listeners = [open_listener(socket.SOCK_DGRAM, UDP_PORT) for _ in range(LISTENER_COUNT)]
+    for udp_socket in listeners:
+        grow_socket_buffer(udp_socket, socket.SO_RCVBUF, UDP_SOCKET_BUFFER_SIZE)  # Avoid drops while the loop is busy
+    logger.info("UDP server listening on port %d with %d listener(s)", UDP_PORT, LISTENER_COUNT)
+    for udp_socket in listeners[1:]:
+        threading.Thread(target=receive_udp_requests, args=(udp_socket,), daemon=True).start()
+    receive_udp_requests(listeners[0])
 
 def start_server():
     """
@@ -139,7 +485,7 @@ def start_server():
     This function initializes the server by starting threads for broadcasting
     offer messages, handling TCP connections, and handling UDP requests.
     """
-    print(colored("Server started, listening on all interfaces", "green"))
+    logger.info("Server started, listening on all interfaces")
     threading.Thread(target=send_offers, daemon=True).start()
     threading.Thread(target=start_tcp_server, daemon=True).start()
     start_udp_server()  # Start the UDP server in the main thread